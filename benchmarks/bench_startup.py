@@ -0,0 +1,66 @@
+"""
+MediaPipe Pose Extractor - 起動時間ベンチマーク
+新しいPythonプロセスで各モジュールの読み込み時間を計測する
+
+使い方:
+  python benchmarks/bench_startup.py
+  python benchmarks/bench_startup.py --runs 10 --report startup.json --max-gui-seconds 0.5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 名前 -> 計測するコード
+TARGETS = {
+    "package": "import pose_extractor",
+    "gui": "import pose_extractor.gui",
+    "core": "import pose_extractor.core",
+    "core+mediapipe": "import pose_extractor.core as c; c.mp_solutions()",
+    # 分割前の単一モジュールが起動時に読み込んでいた依存ライブラリ（比較用）
+    "all_dependencies": "import cv2, mediapipe, tkinter, PIL.ImageTk",
+}
+
+TIMER = "import time; _t = time.perf_counter(); {code}; print(time.perf_counter() - _t)"
+
+
+def measure(code, runs):
+    """code を新しいプロセスで runs 回実行し、読み込み時間（秒）のリストを返す"""
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="起動時間ベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数")
+    parser.add_argument("--report", help="レポートJSONの保存先")
+    parser.add_argument("--max-gui-seconds", type=float, help="GUIモジュールの読み込み時間の上限（超えたら終了コード1）")
+    args = parser.parse_args(argv)
+
+    report = {}
+    for name, code in TARGETS.items():
+        times = measure(code, args.runs)
+        report[name] = {"median_sec": round(statistics.median(times), 4), "min_sec": round(min(times), 4)}
+        print(f"{name:<18} 中央値 {report[name]['median_sec']:.3f}秒  最小 {report[name]['min_sec']:.3f}秒")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.max_gui_seconds is not None and report["gui"]["median_sec"] > args.max_gui_seconds:
+        print(f"❌ GUIの読み込みが上限を超えました: {report['gui']['median_sec']:.3f}秒 > {args.max_gui_seconds}秒")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+MediaPipe Pose Extractor
+
+パッケージの読み込み自体は軽量に保ち、cv2 / mediapipe / tkinter は
+各機能を初めて使ったときに読み込む
+  - constants: 整数インデックスの定数テーブル（依存なし）
+  - core:      画像処理（cv2, numpy, 推論時に mediapipe）
+  - scheduler: メモリ上限付きバッチスケジューラ（PIL）
+  - dedup:     重複画像スキップ用のハッシュインデックス（PIL）
+  - records:   処理結果レコードと隔離リスト（依存なし）
+  - gui:       tkinter GUI
+"""
+
+__version__ = "Free 1.0"
+
+_LAZY_ATTRS = {
+    "process_single_image": "core",
+    "MemoryBudgetScheduler": "scheduler",
+    "PoseHashIndex": "dedup",
+    "main": "gui",
+}
+
+
+def __getattr__(name):
+    # 属性アクセス時にサブモジュールを読み込む
+    if name in _LAZY_ATTRS:
+        from importlib import import_module
+        return getattr(import_module(f".{_LAZY_ATTRS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
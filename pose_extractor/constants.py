@@ -0,0 +1,101 @@
+"""
+MediaPipe Pose Extractor - 定数テーブル
+MediaPipe の列挙型を使わずに整数インデックスで定義し、mediapipe を読み込まずに参照できるようにする
+（値は mp.solutions.pose.PoseLandmark と同じ）
+"""
+
+# ----------------------------------------------------------------------
+# ポーズランドマークのインデックス
+# ----------------------------------------------------------------------
+NOSE = 0
+LEFT_EYE_INNER = 1
+LEFT_EYE = 2
+LEFT_EYE_OUTER = 3
+RIGHT_EYE_INNER = 4
+RIGHT_EYE = 5
+RIGHT_EYE_OUTER = 6
+LEFT_EAR = 7
+RIGHT_EAR = 8
+MOUTH_LEFT = 9
+MOUTH_RIGHT = 10
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_ELBOW = 13
+RIGHT_ELBOW = 14
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_PINKY = 17
+RIGHT_PINKY = 18
+LEFT_INDEX = 19
+RIGHT_INDEX = 20
+LEFT_THUMB = 21
+RIGHT_THUMB = 22
+LEFT_HIP = 23
+RIGHT_HIP = 24
+LEFT_KNEE = 25
+RIGHT_KNEE = 26
+LEFT_ANKLE = 27
+RIGHT_ANKLE = 28
+LEFT_HEEL = 29
+RIGHT_HEEL = 30
+LEFT_FOOT_INDEX = 31
+RIGHT_FOOT_INDEX = 32
+
+# ----------------------------------------------------------------------
+# 接続データと色
+# ----------------------------------------------------------------------
+POSE_CONNECTIONS = [
+    (LEFT_SHOULDER, RIGHT_SHOULDER),
+    (LEFT_SHOULDER, LEFT_HIP),
+    (RIGHT_SHOULDER, RIGHT_HIP),
+    (LEFT_HIP, RIGHT_HIP),
+    (LEFT_SHOULDER, LEFT_ELBOW),
+    (LEFT_ELBOW, LEFT_WRIST),
+    (RIGHT_SHOULDER, RIGHT_ELBOW),
+    (RIGHT_ELBOW, RIGHT_WRIST),
+    (LEFT_HIP, LEFT_KNEE),
+    (LEFT_KNEE, LEFT_ANKLE),
+    (RIGHT_HIP, RIGHT_KNEE),
+    (RIGHT_KNEE, RIGHT_ANKLE),
+    (LEFT_EAR, NOSE),
+    (RIGHT_EAR, NOSE),
+]
+
+# デフォルトの色設定（描画順もこの順序）
+DEFAULT_POSE_COLORS = {
+    NOSE: (0, 0, 255), LEFT_EYE: (255, 0, 0),
+    RIGHT_EYE: (255, 0, 0), LEFT_EAR: (255, 0, 0),
+    RIGHT_EAR: (255, 0, 0), LEFT_SHOULDER: (255, 170, 0),
+    LEFT_ELBOW: (255, 85, 0), LEFT_WRIST: (255, 0, 0),
+    RIGHT_SHOULDER: (0, 0, 255), RIGHT_ELBOW: (0, 85, 255),
+    RIGHT_WRIST: (0, 170, 255), LEFT_HIP: (0, 255, 0),
+    RIGHT_HIP: (0, 255, 0), LEFT_KNEE: (85, 255, 0),
+    LEFT_ANKLE: (170, 255, 0), LEFT_FOOT_INDEX: (255, 255, 0),
+    RIGHT_KNEE: (255, 0, 170), RIGHT_ANKLE: (255, 0, 85),
+    RIGHT_FOOT_INDEX: (255, 0, 0),
+}
+
+# OpenPoseのキーポイント番号 -> MediaPipeのランドマーク番号
+POSE_MAP_MP_TO_OP = {
+    0: NOSE, 2: RIGHT_SHOULDER, 3: RIGHT_ELBOW,
+    4: RIGHT_WRIST, 5: LEFT_SHOULDER, 6: LEFT_ELBOW,
+    7: LEFT_WRIST, 9: RIGHT_HIP, 10: RIGHT_KNEE,
+    11: RIGHT_ANKLE, 12: LEFT_HIP, 13: LEFT_KNEE,
+    14: LEFT_ANKLE, 15: RIGHT_EYE, 16: LEFT_EYE,
+    17: RIGHT_EAR, 18: LEFT_EAR, 19: LEFT_FOOT_INDEX,
+    22: RIGHT_FOOT_INDEX,
+}
+
+# ----------------------------------------------------------------------
+# モード・処理設定
+# ----------------------------------------------------------------------
+MODE_FULL = "Full Control (統合)"
+MODE_SIMPLE = "Simple Pose (簡易)"
+MODE_POSE_HANDS = "Pose + Hands"
+MODES = [MODE_FULL, MODE_SIMPLE, MODE_POSE_HANDS]
+
+# 自動精度: 最初に試すモデル精度と、精度を上げる平均visibilityの閾値
+ADAPTIVE_START_COMPLEXITY = 0
+DEFAULT_ESCALATION_VISIBILITY = 0.5
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
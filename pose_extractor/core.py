@@ -0,0 +1,380 @@
+"""
+MediaPipe Pose Extractor - コア処理
+画像1枚から骨格画像・オーバーレイ・JSONを生成する
+mediapipe は推論・描画で初めて必要になった時点で読み込む
+"""
+
+import io
+import json
+import os
+import struct
+import time
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from PIL import Image, ImageFile
+
+from .constants import (ADAPTIVE_START_COMPLEXITY, DEFAULT_ESCALATION_VISIBILITY, DEFAULT_POSE_COLORS,
+                        MODE_FULL, MODE_POSE_HANDS, MODE_SIMPLE, MODES, POSE_CONNECTIONS, POSE_MAP_MP_TO_OP)
+from .dedup import image_fingerprint, make_profile
+from .records import (DEFAULT_IO_RETRIES, QUARANTINE_STAGES, STAGE_CONFIG, STAGE_DETECT, STAGE_LOAD,
+                      STAGE_RENDER, STAGE_SAVE, STATUS_FAILED, STATUS_NO_PERSON, STATUS_OK, STATUS_QUARANTINED,
+                      make_record, retry_io)
+
+# PILで大きな画像や切り詰められた画像を確実に読み込む
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+Image.MAX_IMAGE_PIXELS = None
+
+
+@lru_cache(maxsize=None)
+def mp_solutions():
+    """mediapipe.solutions を初回使用時に読み込む"""
+    import mediapipe as mp
+    return mp.solutions
+
+
+# ----------------------------------------------------------------------
+# コア処理ロジック
+# ----------------------------------------------------------------------
+def draw_colored_pose_from_lm(pose_image, pose_results, visibility_threshold, h, w, op_keypoints=None, 
+                               line_thickness=4, point_radius=6, pose_colors=None, use_custom_color=False, custom_color=(255, 255, 255)):
+    if pose_colors is None:
+        pose_colors = DEFAULT_POSE_COLORS
+    
+    for lm, color in pose_colors.items():
+        if lm < len(pose_results.pose_landmarks.landmark):
+            landmark = pose_results.pose_landmarks.landmark[lm]
+            if landmark.visibility >= visibility_threshold:
+                x = int(landmark.x * w)
+                y = int(landmark.y * h)
+                final_color = custom_color if use_custom_color else color
+                cv2.circle(pose_image, (x, y), point_radius, final_color, -1)
+    
+    for connection in POSE_CONNECTIONS:
+        start_lm = connection[0]
+        end_lm = connection[1]
+        if start_lm < len(pose_results.pose_landmarks.landmark) and end_lm < len(pose_results.pose_landmarks.landmark):
+            start = pose_results.pose_landmarks.landmark[start_lm]
+            end = pose_results.pose_landmarks.landmark[end_lm]
+            if start.visibility >= visibility_threshold and end.visibility >= visibility_threshold:
+                start_point = (int(start.x * w), int(start.y * h))
+                end_point = (int(end.x * w), int(end.y * h))
+                
+                if use_custom_color:
+                    line_color = custom_color
+                else:
+                    start_color = pose_colors.get(start_lm, (255, 255, 255))
+                    end_color = pose_colors.get(end_lm, (255, 255, 255))
+                    line_color = tuple((np.array(start_color) + np.array(end_color)) // 2)
+                    line_color = tuple(int(c) for c in line_color)
+                
+                cv2.line(pose_image, start_point, end_point, line_color, line_thickness)
+    
+    if op_keypoints:
+        for i, (x, y, c) in enumerate(op_keypoints):
+            if c > 0:
+                color = custom_color if use_custom_color else pose_colors.get(POSE_MAP_MP_TO_OP.get(i), (255, 255, 255))
+                cv2.circle(pose_image, (int(x), int(y)), point_radius, color, -1)
+
+def mean_visibility(pose_landmarks):
+    """ポーズランドマークの平均visibility"""
+    landmarks = pose_landmarks.landmark
+    return sum(lm.visibility for lm in landmarks) / len(landmarks) if landmarks else 0.0
+
+def detect_pose(image_rgb, complexity, adaptive=False, escalation_visibility=DEFAULT_ESCALATION_VISIBILITY):
+    """ポーズ検出を行い (結果, 使用したモデル精度) を返す
+    
+    adaptive=True の場合は軽量モデルから順に試し、未検出または平均visibilityが
+    escalation_visibility 未満のときだけ complexity まで精度を上げる。
+    """
+    start = min(ADAPTIVE_START_COMPLEXITY, complexity) if adaptive else complexity
+    fallback = None
+    for tier in range(start, complexity + 1):
+        with mp_solutions().pose.Pose(static_image_mode=True, model_complexity=tier, 
+                                      min_detection_confidence=0.5) as pose:
+            results = pose.process(image_rgb)
+        if results.pose_landmarks:
+            if tier == complexity or mean_visibility(results.pose_landmarks) >= escalation_visibility:
+                return results, tier
+            fallback = (results, tier)
+    # 最も重いモデルで未検出なら、軽量モデルでの検出結果を使う
+    return fallback or (results, complexity)
+
+def read_bytes(filename):
+    with open(filename, 'rb') as f:
+        return f.read()
+
+def write_bytes(filename, data):
+    with open(filename, 'wb') as f:
+        f.write(data)
+
+def decode_image(data):
+    """画像データをデコードし、RGBAはRGBに変換したPIL画像を返す
+    
+    ファイル読み込み（再試行対象）と分けてあるため、ここで起きる例外は
+    壊れた画像などの恒久的なエラーとして扱われる。
+    """
+    img_pil = Image.open(io.BytesIO(data))
+    img_pil.load()
+    if img_pil.mode == 'RGBA':
+        img_pil = img_pil.convert('RGB')
+    return img_pil
+
+def is_corrupt_image_error(error):
+    """壊れた画像・未対応形式によるデコード失敗かどうか（隔離対象）
+    
+    メモリ不足や errno を持つOSレベルのエラー（権限など）は環境による失敗なので隔離しない。
+    """
+    if isinstance(error, cv2.error):
+        return error.code != cv2.Error.StsNoMem
+    if isinstance(error, OSError):
+        # PILのデコードエラー（UnidentifiedImageError など）は errno を持たない
+        return error.errno is None
+    return isinstance(error, (SyntaxError, EOFError, ValueError, struct.error))
+
+def encode_png(img):
+    """PNGにエンコードしたバイト列を返す（失敗は再試行しない ValueError）"""
+    success, encoded_img = cv2.imencode('.png', img)
+    if not success:
+        raise ValueError("PNGのエンコードに失敗")
+    return encoded_img.tobytes()
+
+def write_json(filename, json_data):
+    with open(filename, 'w') as f:
+        json.dump(json_data, f, indent=2)
+
+def detect_hands(image_rgb):
+    """手のランドマーク検出"""
+    with mp_solutions().hands.Hands(static_image_mode=True, max_num_hands=2, 
+                                     min_detection_confidence=0.5) as hands:
+        return hands.process(image_rgb)
+
+def detect_face(image_rgb):
+    """顔のランドマーク検出"""
+    with mp_solutions().face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1, 
+                                            min_detection_confidence=0.5) as face_mesh:
+        return face_mesh.process(image_rgb)
+
+def results_from_json(json_data):
+    """出力JSONからMediaPipeの検出結果と同じ形のオブジェクトを復元する
+    
+    座標は正規化座標のまま保存されているため、描画時に画像サイズを掛けるだけで
+    リサイズされた画像にもそのまま使える。
+    """
+    from mediapipe.framework.formats import landmark_pb2
+    
+    def to_landmark_list(landmarks):
+        return landmark_pb2.NormalizedLandmarkList(
+            landmark=[landmark_pb2.NormalizedLandmark(**lm) for lm in landmarks])
+    
+    pose = json_data.get("pose")
+    hands = json_data.get("hands") or []
+    face = json_data.get("face")
+    pose_results = SimpleNamespace(pose_landmarks=to_landmark_list(pose) if pose else None)
+    hand_results = SimpleNamespace(multi_hand_landmarks=[to_landmark_list(hand) for hand in hands] or None)
+    face_results = SimpleNamespace(multi_face_landmarks=[to_landmark_list(face)] if face else None)
+    return pose_results, hand_results, face_results
+
+def process_single_image(input_path, output_dir, mode, complexity, visibility, 
+                         line_thickness, point_radius, background_color, use_custom_color, 
+                         custom_color, single_color_mode, log_func=None,
+                         adaptive_complexity=False, escalation_visibility=DEFAULT_ESCALATION_VISIBILITY,
+                         dedup_index=None, quarantine=None, io_retries=DEFAULT_IO_RETRIES):
+    """画像1枚を処理し、処理結果レコード（records.make_record）を返す"""
+    start_time = time.perf_counter()
+    base_name = Path(input_path).stem
+    counter = {"retries": 0}
+    stage = STAGE_CONFIG
+    
+    # 隔離中のファイルはスキップ
+    entry = quarantine.get(input_path) if quarantine is not None else None
+    if entry is not None:
+        if log_func:
+            log_func(f"⏭️ 隔離中のためスキップ: {base_name} ({entry['stage']}/{entry['error']})")
+        return make_record(input_path, STATUS_QUARANTINED, time.perf_counter() - start_time,
+                           stage=entry["stage"], quarantined_error=entry["error"])
+    
+    try:
+        if mode not in MODES:
+            raise ValueError(f"不明なモード: {mode}")
+        
+        # 画像読み込み
+        stage = STAGE_LOAD
+        data = retry_io(lambda: read_bytes(input_path), counter, io_retries, log_func)
+        img_pil = decode_image(data)
+        image = np.array(img_pil)
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        h, w = image.shape[:2]
+        
+        # 骨格画像生成
+        pose_image = np.full((h, w, 3), background_color, dtype=np.uint8)
+        
+        # MediaPipe処理（重複画像はインデックスの結果を再利用）
+        stage = STAGE_DETECT
+        mp_pose = mp_solutions().pose
+        mp_hands = mp_solutions().hands
+        mp_face_mesh = mp_solutions().face_mesh
+        mp_drawing = mp_solutions().drawing_utils
+        cached = None
+        fingerprint = image_fingerprint(img_pil) if dedup_index is not None else None
+        if fingerprint is not None:
+            profile = make_profile(mode, complexity, adaptive_complexity, escalation_visibility)
+            cached = dedup_index.find(fingerprint, profile, w, h)
+        
+        if cached:
+            pose_results, hand_results, face_results = results_from_json(cached["json"])
+            pose_tier = cached["json"].get("model_complexity")
+            if log_func:
+                log_func(f"   ♻️ 重複画像のため結果を再利用: {Path(cached['source']).name}")
+        else:
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            pose_results, pose_tier = detect_pose(image_rgb, complexity, adaptive_complexity, escalation_visibility)
+            hand_results = detect_hands(image_rgb) if mode in (MODE_FULL, MODE_POSE_HANDS) else None
+            face_results = detect_face(image_rgb) if mode == MODE_FULL else None
+        
+        stage = STAGE_RENDER
+        if mode == MODE_FULL:
+            # オーバーレイ画像の生成
+            overlay = image.copy()
+            
+            # Pose描画
+            if pose_results.pose_landmarks:
+                draw_colored_pose_from_lm(pose_image, pose_results, visibility, h, w, 
+                                           line_thickness=line_thickness, point_radius=point_radius,
+                                           use_custom_color=single_color_mode, custom_color=custom_color)
+                mp_drawing.draw_landmarks(overlay, pose_results.pose_landmarks, 
+                                           mp_pose.POSE_CONNECTIONS)
+            
+            # Hands描画
+            if hand_results.multi_hand_landmarks:
+                for hand_landmarks in hand_results.multi_hand_landmarks:
+                    for landmark in hand_landmarks.landmark:
+                        x = int(landmark.x * w)
+                        y = int(landmark.y * h)
+                        color = custom_color if single_color_mode else (0, 255, 0)
+                        cv2.circle(pose_image, (x, y), max(1, point_radius//2), color, -1)
+                    mp_drawing.draw_landmarks(overlay, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            
+            # Face描画
+            if face_results.multi_face_landmarks:
+                for face_landmarks in face_results.multi_face_landmarks:
+                    for i, landmark in enumerate(face_landmarks.landmark):
+                        if i % 5 == 0:  # 間引いて描画
+                            x = int(landmark.x * w)
+                            y = int(landmark.y * h)
+                            color = custom_color if single_color_mode else (255, 255, 0)
+                            cv2.circle(pose_image, (x, y), max(1, point_radius//3), color, -1)
+                    mp_drawing.draw_landmarks(overlay, face_landmarks, mp_face_mesh.FACEMESH_TESSELATION)
+            
+            # JSON生成
+            json_data = {"pose": None, "hands": [], "face": None}
+            
+            if pose_results.pose_landmarks:
+                json_data["pose"] = [{"x": lm.x, "y": lm.y, "z": lm.z, "visibility": lm.visibility}
+                                      for lm in pose_results.pose_landmarks.landmark]
+            
+            if hand_results.multi_hand_landmarks:
+                json_data["hands"] = [[{"x": lm.x, "y": lm.y, "z": lm.z} 
+                                        for lm in hand_landmarks.landmark]
+                                       for hand_landmarks in hand_results.multi_hand_landmarks]
+            
+            if face_results.multi_face_landmarks:
+                json_data["face"] = [{"x": lm.x, "y": lm.y, "z": lm.z}
+                                      for lm in face_results.multi_face_landmarks[0].landmark]
+            
+        elif mode == MODE_SIMPLE:
+            overlay = image.copy()
+            
+            if pose_results.pose_landmarks:
+                draw_colored_pose_from_lm(pose_image, pose_results, visibility, h, w, 
+                                           line_thickness=line_thickness, point_radius=point_radius,
+                                           use_custom_color=single_color_mode, custom_color=custom_color)
+                mp_drawing.draw_landmarks(overlay, pose_results.pose_landmarks, 
+                                           mp_pose.POSE_CONNECTIONS)
+            
+            json_data = {"pose": None}
+            if pose_results.pose_landmarks:
+                json_data["pose"] = [{"x": lm.x, "y": lm.y, "z": lm.z, "visibility": lm.visibility}
+                                      for lm in pose_results.pose_landmarks.landmark]
+        
+        elif mode == MODE_POSE_HANDS:
+            overlay = image.copy()
+            
+            if pose_results.pose_landmarks:
+                draw_colored_pose_from_lm(pose_image, pose_results, visibility, h, w, 
+                                           line_thickness=line_thickness, point_radius=point_radius,
+                                           use_custom_color=single_color_mode, custom_color=custom_color)
+                mp_drawing.draw_landmarks(overlay, pose_results.pose_landmarks, 
+                                           mp_pose.POSE_CONNECTIONS)
+            
+            if hand_results.multi_hand_landmarks:
+                for hand_landmarks in hand_results.multi_hand_landmarks:
+                    for landmark in hand_landmarks.landmark:
+                        x = int(landmark.x * w)
+                        y = int(landmark.y * h)
+                        color = custom_color if single_color_mode else (0, 255, 0)
+                        cv2.circle(pose_image, (x, y), max(1, point_radius//2), color, -1)
+                    mp_drawing.draw_landmarks(overlay, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            
+            json_data = {"pose": None, "hands": []}
+            
+            if pose_results.pose_landmarks:
+                json_data["pose"] = [{"x": lm.x, "y": lm.y, "z": lm.z, "visibility": lm.visibility}
+                                      for lm in pose_results.pose_landmarks.landmark]
+            
+            if hand_results.multi_hand_landmarks:
+                json_data["hands"] = [[{"x": lm.x, "y": lm.y, "z": lm.z} 
+                                        for lm in hand_landmarks.landmark]
+                                       for hand_landmarks in hand_results.multi_hand_landmarks]
+        
+        # 自動精度の場合は使用したモデル精度を記録
+        if adaptive_complexity and pose_tier is not None:
+            json_data["model_complexity"] = pose_tier
+            if log_func:
+                log_func(f"   モデル精度: {pose_tier}")
+        
+        if fingerprint is not None and not cached:
+            dedup_index.add(fingerprint, profile, w, h, json_data, input_path)
+        
+        # 結果の保存
+        stage = STAGE_SAVE
+        retry_io(lambda: os.makedirs(output_dir, exist_ok=True), counter, io_retries, log_func)
+        
+        # 骨格画像を保存
+        pose_path = os.path.join(output_dir, f"{base_name}_pose.png")
+        pose_png = encode_png(pose_image)
+        retry_io(lambda: write_bytes(pose_path, pose_png), counter, io_retries, log_func)
+        
+        # オーバーレイ画像を保存
+        overlay_path = os.path.join(output_dir, f"{base_name}_overlay.png")
+        overlay_png = encode_png(overlay)
+        retry_io(lambda: write_bytes(overlay_path, overlay_png), counter, io_retries, log_func)
+        
+        # JSONを保存
+        json_path = os.path.join(output_dir, f"{base_name}_pose.json")
+        retry_io(lambda: write_json(json_path, json_data), counter, io_retries, log_func)
+        
+    except Exception as e:
+        record = make_record(input_path, STATUS_FAILED, time.perf_counter() - start_time,
+                             stage=stage, error=e, retries=counter["retries"])
+        if log_func:
+            log_func(f"❌ エラー [{stage}] {type(e).__name__}: {e}")
+        if quarantine is not None and stage in QUARANTINE_STAGES and is_corrupt_image_error(e):
+            quarantine.add(record)
+        return record
+    
+    detected = bool(pose_results.pose_landmarks or
+                    (hand_results and hand_results.multi_hand_landmarks) or
+                    (face_results and face_results.multi_face_landmarks))
+    if log_func:
+        if detected:
+            log_func(f"✅ 処理完了: {base_name}")
+        else:
+            log_func(f"⚠️ 人物が検出されませんでした: {base_name}")
+    
+    return make_record(input_path, STATUS_OK if detected else STATUS_NO_PERSON, time.perf_counter() - start_time,
+                       retries=counter["retries"], model_complexity=pose_tier, reused=bool(cached))
+
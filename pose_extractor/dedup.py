@@ -0,0 +1,282 @@
+"""
+MediaPipe Pose Extractor - 重複画像スキップ用の知覚ハッシュインデックス
+再エンコード・リサイズされた同一画像を検出し、推論を省略して既存のランドマークを再利用する
+インデックスはJSONファイルに保存され、複数のバッチで共有できる
+"""
+
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+
+from PIL import Image
+
+HASH_SIZE = 16                 # dHashの一辺（HASH_SIZE² ビット）
+DEFAULT_MAX_DISTANCE = 4       # 重複候補とみなすハミング距離の上限
+MIN_HASH_BITS = 16             # 立っているビット（または立っていないビット）がこれ未満の平坦な画像は対象外
+THUMBNAIL_SIZE = 32            # 確認用グレースケール縮小画像の一辺
+THUMBNAIL_MAX_DIFF = 6         # 縮小画像の画素差の最大値がこれ以下なら重複と確定
+REDUCED_MIN_SIDE = THUMBNAIL_SIZE * 4  # ハッシュ計算前の整数倍縮小で残す短辺の長さ
+ASPECT_TOLERANCE = 0.01        # 縦横比の許容差（正規化座標をそのまま使える範囲）
+MAX_ENTRIES = 5000             # インデックスの上限（超えたら最後に使われた時刻が古いものから削除）
+INDEX_FILENAME = "pose_hash_index.json"
+INDEX_VERSION = 5
+
+# 保存するランドマークの種類 -> 1点あたりのフィールド
+LANDMARK_FIELDS = {
+    "pose": ("x", "y", "z", "visibility"),
+    "hands": ("x", "y", "z"),
+    "face": ("x", "y", "z"),
+}
+
+
+def image_hash(img_pil, hash_size=HASH_SIZE):
+    """差分ハッシュ（dHash）を整数で返す"""
+    gray = img_pil.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = list(gray.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return value
+
+
+def image_thumbnail(img_pil, size=THUMBNAIL_SIZE):
+    """重複確認用のグレースケール縮小画像（バイト列）"""
+    return img_pil.convert("L").resize((size, size), Image.Resampling.BOX).tobytes()
+
+
+def reduced_gray(img_pil, min_side=REDUCED_MIN_SIDE):
+    """整数倍の縮小（Image.reduce）で小さくしてからグレースケールにする
+    
+    元の解像度のグレースケール画像やリサンプリングを作らないため、巨大画像でも追加メモリはわずか。
+    """
+    factor = min(img_pil.size) // min_side
+    if factor > 1:
+        if img_pil.mode in ("1", "P"):
+            img_pil = img_pil.convert("L")
+        img_pil = img_pil.reduce(factor)
+    return img_pil.convert("L")
+
+
+def image_fingerprint(img_pil):
+    """(ハッシュ, 縮小画像) を返す。情報量の少ない平坦な画像は誤判定を避けるため None"""
+    gray = reduced_gray(img_pil)
+    phash = image_hash(gray)
+    bits = bin(phash).count("1")
+    if bits < MIN_HASH_BITS or bits > HASH_SIZE * HASH_SIZE - MIN_HASH_BITS:
+        return None
+    return phash, image_thumbnail(gray)
+
+
+def make_profile(mode, complexity, adaptive=False, escalation_visibility=None):
+    """結果を再利用できる処理設定の識別子（モード・モデル精度・自動精度の設定）"""
+    adaptive_key = f"adaptive={escalation_visibility}" if adaptive else "adaptive=off"
+    return f"{mode}|complexity={complexity}|{adaptive_key}"
+
+
+def _pack_landmarks(landmarks, fields):
+    # MediaPipeの座標は float32 なので、float32 のリトルエンディアンで保存しても値は変わらない
+    values = array("f", (lm[field] for lm in landmarks for field in fields))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _unpack_landmarks(text, fields):
+    values = array("f")
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        values.byteswap()
+    n = len(fields)
+    return [dict(zip(fields, values[i:i + n])) for i in range(0, len(values), n)]
+
+
+def encode_landmarks(json_data):
+    """出力JSONのランドマークを float32 のバイナリ（base64）に詰めた辞書にする"""
+    packed = {}
+    for key, fields in LANDMARK_FIELDS.items():
+        if key not in json_data:
+            continue
+        value = json_data[key]
+        if value is None:
+            packed[key] = None
+        elif key == "hands":
+            packed[key] = [_pack_landmarks(hand, fields) for hand in value]
+        else:
+            packed[key] = _pack_landmarks(value, fields)
+    if "model_complexity" in json_data:
+        packed["model_complexity"] = json_data["model_complexity"]
+    return packed
+
+
+def decode_landmarks(packed):
+    """encode_landmarks の逆変換（出力JSONと同じ形に戻す）"""
+    json_data = {}
+    for key, fields in LANDMARK_FIELDS.items():
+        if key not in packed:
+            continue
+        value = packed[key]
+        if value is None:
+            json_data[key] = None
+        elif key == "hands":
+            json_data[key] = [_unpack_landmarks(hand, fields) for hand in value]
+        else:
+            json_data[key] = _unpack_landmarks(value, fields)
+    if "model_complexity" in packed:
+        json_data["model_complexity"] = packed["model_complexity"]
+    return json_data
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def thumbnail_max_diff(a, b):
+    return max(abs(x - y) for x, y in zip(a, b))
+
+
+def _is_valid_entry(entry):
+    """インデックスファイルから読んだエントリが使える形かどうか"""
+    try:
+        int(entry["hash"], 16)
+        return (len(base64.b64decode(entry["thumbnail"])) == THUMBNAIL_SIZE * THUMBNAIL_SIZE and
+                entry["width"] > 0 and entry["height"] > 0 and isinstance(entry["profile"], str) and
+                isinstance(entry["source"], str) and isinstance(entry["landmarks"], dict) and
+                isinstance(entry["last_used"], (int, float)))
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+class _BKNode:
+    __slots__ = ("key", "items", "children")
+
+    def __init__(self, key, item):
+        self.key = key
+        self.items = [item]
+        self.children = {}
+
+
+class BKTree:
+    """ハミング距離によるBK-tree"""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, key, item):
+        if self.root is None:
+            self.root = _BKNode(key, item)
+            return
+        node = self.root
+        while True:
+            distance = hamming_distance(key, node.key)
+            if distance == 0:
+                node.items.append(item)
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _BKNode(key, item)
+                return
+            node = child
+
+    def search(self, key, max_distance):
+        """距離 max_distance 以内の (距離, item) を距離順で返す"""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(key, node.key)
+            if distance <= max_distance:
+                found.extend((distance, item) for item in node.items)
+            for child_distance, child in node.children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+
+class PoseHashIndex:
+    """知覚ハッシュ -> 処理済みランドマークの永続インデックス"""
+
+    def __init__(self, path, max_distance=DEFAULT_MAX_DISTANCE, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self.entries = []
+        self.tree = BKTree()
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """インデックスファイルを読み込む（無い・壊れている場合は空で開始）"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("hash_size") != HASH_SIZE:
+                return
+            entries = list(data.get("entries", []))
+        except (OSError, ValueError, AttributeError, TypeError):
+            return
+        for entry in entries:
+            # 壊れたエントリは1件ずつ読み飛ばす
+            if _is_valid_entry(entry):
+                self._insert(entry)
+
+    def save(self):
+        """インデックスファイルを書き出す（上限を超えた分は古いものから削除）"""
+        with self._lock:
+            self._prune()
+            data = {"version": INDEX_VERSION, "hash_size": HASH_SIZE, "entries": list(self.entries)}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _insert(self, entry):
+        self.entries.append(entry)
+        self.tree.add(int(entry["hash"], 16), entry)
+
+    def _prune(self):
+        if len(self.entries) <= self.max_entries:
+            return
+        entries = sorted(self.entries, key=lambda entry: entry["last_used"])[-self.max_entries:]
+        self.entries = []
+        self.tree = BKTree()
+        for entry in entries:
+            self._insert(entry)
+
+    def find(self, fingerprint, profile, width, height):
+        """同じ処理設定・縦横比で、ハッシュと縮小画像の両方が一致する結果を返す（無ければ None）
+        
+        戻り値は {"source": 元画像のパス, "json": 出力JSONと同じ形のランドマーク}。
+        """
+        phash, thumbnail = fingerprint
+        aspect = width / height
+        with self._lock:
+            candidates = self.tree.search(phash, self.max_distance)
+        for _, entry in candidates:
+            entry_aspect = entry["width"] / entry["height"]
+            if entry["profile"] != profile or abs(entry_aspect - aspect) > ASPECT_TOLERANCE * aspect:
+                continue
+            if thumbnail_max_diff(base64.b64decode(entry["thumbnail"]), thumbnail) <= THUMBNAIL_MAX_DIFF:
+                with self._lock:
+                    entry["last_used"] = int(time.time())
+                return {"source": entry["source"], "json": decode_landmarks(entry["landmarks"])}
+        return None
+
+    def add(self, fingerprint, profile, width, height, json_data, source):
+        """処理結果をインデックスに追加"""
+        phash, thumbnail = fingerprint
+        entry = {"hash": f"{phash:x}", "thumbnail": base64.b64encode(thumbnail).decode("ascii"),
+                 "profile": profile, "width": width, "height": height,
+                 "source": str(source), "landmarks": encode_landmarks(json_data),
+                 "last_used": int(time.time())}
+        with self._lock:
+            self._insert(entry)
@@ -0,0 +1,170 @@
+"""
+MediaPipe Pose Extractor - 処理結果レコードと隔離リスト
+ファイルごとの処理結果（状態・エラー種別・段階・時間）を記録し、
+恒久的に失敗するファイルを隔離リストに入れて次回以降の処理から除外する
+"""
+
+import errno
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+
+# 処理結果の状態
+STATUS_OK = "ok"                    # 骨格を検出して保存
+STATUS_NO_PERSON = "no_person"      # 処理は成功したが人物が検出されなかった
+STATUS_FAILED = "failed"            # エラーで処理できなかった
+STATUS_QUARANTINED = "quarantined"  # 隔離リストに載っているためスキップ
+
+# 出力ファイルとして処理できた状態
+PROCESSED_STATUSES = (STATUS_OK, STATUS_NO_PERSON)
+
+# 処理段階
+STAGE_CONFIG = "config"
+STAGE_LOAD = "load"
+STAGE_DETECT = "detect"
+STAGE_RENDER = "render"
+STAGE_SAVE = "save"
+
+# 隔離対象とする段階（推論環境のエラーで全ファイルを隔離しない）
+# この段階でも隔離するのは壊れた画像などファイル自体が原因の失敗のみ（core.is_corrupt_image_error）
+QUARANTINE_STAGES = (STAGE_LOAD,)
+
+# 一時的なI/Oエラーの再試行
+DEFAULT_IO_RETRIES = 2
+RETRY_DELAY_SEC = 0.5
+TRANSIENT_ERRNOS = {errno.EAGAIN, errno.EINTR, errno.EIO, errno.EBUSY, errno.ETIMEDOUT, errno.ESTALE}
+
+QUARANTINE_FILENAME = "quarantine.json"
+RESULTS_FILENAME = "process_results.json"
+
+
+def is_transient_error(error):
+    """再試行で回復し得るOSレベルのI/Oエラーかどうか
+    
+    PILのデコードエラーなど errno を持たない OSError は恒久的なエラーとして扱う。
+    """
+    if isinstance(error, (InterruptedError, BlockingIOError, TimeoutError)):
+        return True
+    return isinstance(error, OSError) and error.errno in TRANSIENT_ERRNOS
+
+
+def retry_io(func, counter, retries=DEFAULT_IO_RETRIES, log_func=None):
+    """一時的なI/Oエラーのときだけ func() を最大 retries 回再試行する
+    
+    再試行した回数は counter["retries"] に加算する。
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= retries or not is_transient_error(e):
+                raise
+            counter["retries"] += 1
+            if log_func:
+                log_func(f"   🔁 再試行 ({attempt + 1}/{retries}): {type(e).__name__}: {e}")
+            time.sleep(RETRY_DELAY_SEC * (attempt + 1))
+
+
+def make_record(input_path, status, elapsed, stage=None, error=None, retries=0, **extra):
+    """1ファイル分の処理結果レコード"""
+    record = {
+        "file": str(input_path),
+        "status": status,
+        "stage": stage,
+        "error": type(error).__name__ if error is not None else None,
+        "message": str(error) if error is not None else None,
+        "elapsed_sec": round(elapsed, 3),
+        "retries": retries,
+    }
+    record.update(extra)
+    return record
+
+
+def _file_signature(path):
+    """ファイルの同一性判定用 (サイズ, 更新時刻)。取得できなければ None"""
+    try:
+        stat = os.stat(path)
+        return [stat.st_size, int(stat.st_mtime)]
+    except OSError:
+        return None
+
+
+class QuarantineList:
+    """恒久的に失敗したファイルの永続リスト（ファイルが更新されたら対象外になる）"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """隔離リストを読み込む（無い・壊れている場合は空で開始）"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            self.entries = {}
+
+    def save(self):
+        """隔離リストを書き出す"""
+        with self._lock:
+            data = {"entries": dict(self.entries)}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, input_path):
+        """隔離中ならそのエントリを返す（ファイルが変わっていれば None）"""
+        key = os.path.abspath(input_path)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry.get("signature") == _file_signature(input_path):
+            return entry
+        return None
+
+    def add(self, record):
+        """失敗レコードを隔離リストに追加"""
+        key = os.path.abspath(record["file"])
+        with self._lock:
+            previous = self.entries.get(key, {})
+            self.entries[key] = {
+                "signature": _file_signature(record["file"]),
+                "stage": record["stage"],
+                "error": record["error"],
+                "message": record["message"],
+                "failures": previous.get("failures", 0) + 1,
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+
+
+def summarize_results(records):
+    """レコードを状態別・エラー種別に集計する"""
+    statuses = Counter(record["status"] for record in records)
+    errors = Counter(f"{record['stage']}/{record['error']}" for record in records
+                     if record["status"] == STATUS_FAILED)
+    return {"total": len(records), "statuses": dict(statuses), "errors": dict(errors)}
+
+
+def format_summary(summary):
+    """集計結果をログ用の文字列にする"""
+    statuses = summary["statuses"]
+    lines = [f"成功: {statuses.get(STATUS_OK, 0)}  人物未検出: {statuses.get(STATUS_NO_PERSON, 0)}  "
+             f"失敗: {statuses.get(STATUS_FAILED, 0)}  隔離スキップ: {statuses.get(STATUS_QUARANTINED, 0)}"]
+    for key, count in sorted(summary["errors"].items(), key=lambda item: -item[1]):
+        lines.append(f"  失敗内訳 {key}: {count}件")
+    return "\n".join(lines)
+
+
+def write_results(path, records, summary):
+    """処理結果レコードをJSONに保存"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"summary": summary, "records": records}, f, indent=2, ensure_ascii=False)
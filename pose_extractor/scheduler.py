@@ -0,0 +1,189 @@
+"""
+MediaPipe Pose Extractor - メモリ上限付きバッチスケジューラ
+画像ヘッダ（サイズのみ、デコードなし）から必要メモリを見積もり、
+RAM上限を超えないように並列処理へ投入する
+"""
+
+import ctypes
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageFile
+
+# PILで巨大画像のヘッダを読めるようにする（core は遅延読み込みのため、見積もり前にここでも設定する）
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+Image.MAX_IMAGE_PIXELS = None
+
+# 1画素あたりのメモリ見積もり（バイト）
+# PILの読み込み・numpy変換・BGR/RGB変換・骨格画像・オーバーレイ・MediaPipe入力・PNGエンコードで
+# 3チャンネル画像 約12枚分を同時に保持する
+BYTES_PER_PIXEL = 3 * 12
+# 1ジョブあたりの固定メモリ（MediaPipeのグラフとモデル）
+BASE_JOB_MEMORY = 200 * 1024 * 1024
+
+DEFAULT_MEMORY_BUDGET_MB = 4096
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+def read_image_size(path):
+    """画像ヘッダのみを読み、(幅, 高さ) を返す（読めない場合は None）"""
+    try:
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def estimate_image_memory(size):
+    """画像サイズから1ジョブのピークメモリ（バイト）を見積もる"""
+    width, height = size
+    return BASE_JOB_MEMORY + width * height * BYTES_PER_PIXEL
+
+
+def interleave_by_size(jobs):
+    """見積もりの大きいジョブと小さいジョブを交互に並べる"""
+    ordered = sorted(jobs, key=lambda job: job["estimate"], reverse=True)
+    result = []
+    lo, hi = 0, len(ordered) - 1
+    while lo <= hi:
+        result.append(ordered[lo])
+        if lo != hi:
+            result.append(ordered[hi])
+        lo += 1
+        hi -= 1
+    return result
+
+
+def current_rss_bytes():
+    """現在のプロセスの常駐メモリ量（取得できない場合は None）"""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        if sys.platform == "win32":
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        # macOS など: 現在値が取れないのでピーク値で代用
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+    except Exception:
+        return None
+
+
+class MemoryBudgetScheduler:
+    """メモリ見積もりの合計が上限を超えないようにジョブを並列実行する"""
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, max_workers=1):
+        self.budget = int(memory_budget_mb * 1024 * 1024)
+        self.max_workers = max(1, int(max_workers))
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._running = 0
+        self.estimated_peak = 0
+
+    def plan(self, paths):
+        """ヘッダを読んで見積もりを付け、実行順に並べたジョブ一覧を返す"""
+        jobs = []
+        for index, path in enumerate(paths):
+            size = read_image_size(path)
+            # サイズ不明の画像は上限いっぱいを見積もり、単独で処理する
+            estimate = estimate_image_memory(size) if size is not None else max(self.budget, BASE_JOB_MEMORY)
+            jobs.append({"index": index, "path": path, "size": size, "estimate": estimate})
+        return interleave_by_size(jobs)
+
+    def _acquire(self, estimate):
+        # 実行中のジョブが無ければ上限を超える単独ジョブも許可する
+        with self._cond:
+            while self._running and (self._running >= self.max_workers or
+                                     self._in_use + estimate > self.budget):
+                self._cond.wait()
+            self._in_use += estimate
+            self._running += 1
+            self.estimated_peak = max(self.estimated_peak, self._in_use)
+
+    def _release(self, estimate):
+        with self._cond:
+            self._in_use -= estimate
+            self._running -= 1
+            self._cond.notify_all()
+
+    def run(self, paths, func, log_func=None):
+        """paths の各ファイルに func(path) を実行し、(入力順の結果リスト, メモリレポート) を返す"""
+        jobs = self.plan(paths)
+        results = [None] * len(jobs)
+        self.estimated_peak = 0
+
+        if log_func:
+            for job in jobs:
+                if job["size"] is None:
+                    log_func(f"⚠️ 画像サイズを読めないため単独で処理します: {os.path.basename(job['path'])}")
+                elif job["estimate"] > self.budget:
+                    log_func(f"⚠️ メモリ上限を超える画像のため単独で処理します: {os.path.basename(job['path'])} "
+                             f"(見積もり {job['estimate'] / 1024 / 1024:.0f}MB)")
+
+        # 実メモリのピークをサンプリング
+        baseline = current_rss_bytes()
+        peak = [baseline]
+        sampling = threading.Event()
+
+        def sample():
+            while not sampling.wait(RSS_SAMPLE_INTERVAL):
+                rss = current_rss_bytes()
+                if rss is not None and (peak[0] is None or rss > peak[0]):
+                    peak[0] = rss
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+
+        def worker(job):
+            try:
+                results[job["index"]] = func(job["path"])
+            finally:
+                self._release(job["estimate"])
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = []
+                for job in jobs:
+                    self._acquire(job["estimate"])
+                    futures.append(executor.submit(worker, job))
+                for future in futures:
+                    future.result()
+        finally:
+            sampling.set()
+            sampler.join()
+
+        report = {
+            "budget_bytes": self.budget,
+            "estimated_peak_bytes": self.estimated_peak,
+            "baseline_rss_bytes": baseline,
+            "actual_peak_rss_bytes": peak[0],
+        }
+        return results, report
+
+
+def format_memory_report(report):
+    """メモリレポートをログ用の文字列にする"""
+    mb = 1024 * 1024
+    text = (f"メモリ: 見積もりピーク {report['estimated_peak_bytes'] / mb:.0f}MB "
+            f"/ 上限 {report['budget_bytes'] / mb:.0f}MB")
+    if report["actual_peak_rss_bytes"] is not None and report["baseline_rss_bytes"] is not None:
+        used = report["actual_peak_rss_bytes"] - report["baseline_rss_bytes"]
+        text += f", 実測ピーク増加 {used / mb:.0f}MB (プロセス全体 {report['actual_peak_rss_bytes'] / mb:.0f}MB)"
+    return text
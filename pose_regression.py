@@ -0,0 +1,596 @@
+"""
+MediaPipe Pose Extractor - 回帰テストハーネス
+固定コーパスを全モードで処理し、ゴールデン出力との差分とスループットを記録する
+
+使い方:
+  python pose_regression.py --update   # 現在の出力をゴールデンとして保存（1件でも失敗したら更新しない）
+  python pose_regression.py            # ゴールデンと比較（差分があれば終了コード1）
+  python pose_regression.py --robustness  # 再試行・隔離・メモリ上限の動作確認（ゴールデン不要）
+
+mediapipe / opencv の更新や高速化の前後で実行し、結果が変わっていないことを確認する。
+
+コーパス (regression/corpus) とゴールデン (regression/golden) はリポジトリで管理する。
+ゴールデンを更新したら regression/golden/ 以下をコミットすること。
+ゴールデン作成時の設定とライブラリのバージョンは regression/golden/settings.json に保存され、
+比較時はその設定で処理する（--complexity / --adaptive が食い違う場合はエラー）。
+"""
+
+import argparse
+import errno
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from pose_extractor.constants import IMAGE_EXTENSIONS, MODE_FULL, MODE_POSE_HANDS, MODE_SIMPLE
+from pose_extractor import core, records as records_module
+from pose_extractor.core import encode_png, process_single_image, write_bytes
+from pose_extractor.dedup import INDEX_FILENAME, PoseHashIndex
+from pose_extractor.records import (PROCESSED_STATUSES, QUARANTINE_FILENAME, STAGE_LOAD, STATUS_FAILED,
+                                    STATUS_OK, STATUS_QUARANTINED, QuarantineList)
+from pose_extractor.scheduler import MemoryBudgetScheduler, estimate_image_memory, read_image_size
+
+# ----------------------------------------------------------------------
+# 設定
+# ----------------------------------------------------------------------
+HERE = Path(__file__).resolve().parent
+DEFAULT_CORPUS_DIR = HERE / "regression" / "corpus"
+DEFAULT_GOLDEN_DIR = HERE / "regression" / "golden"
+GOLDEN_SETTINGS_FILENAME = "settings.json"
+# ゴールデンの再現に影響する設定
+GOLDEN_SETTING_KEYS = ("complexity", "adaptive_complexity")
+
+# モード名 -> 出力フォルダ名
+MODES = {
+    MODE_FULL: "full",
+    MODE_SIMPLE: "simple",
+    MODE_POSE_HANDS: "pose_hands",
+}
+
+# 描画設定は GUI のデフォルト値に合わせる
+# モデル精度は mediapipe に同梱されている full モデル (1) を使う（heavy は初回にダウンロードが必要）
+RENDER_SETTINGS = {
+    "complexity": 1,
+    "visibility": 0.0,
+    "line_thickness": 4,
+    "point_radius": 6,
+    "background_color": (0, 0, 0),
+    "use_custom_color": False,
+    "custom_color": (255, 255, 255),
+    "single_color_mode": False,
+    "adaptive_complexity": False,
+    "dedup": False,
+}
+
+GOLDEN_SUFFIXES = ("_pose.json", "_pose.png")  # ゴールデンとして保存・比較する出力
+
+LANDMARK_ATOL = 1e-4        # ランドマーク座標の許容誤差（正規化座標）
+PIXEL_TOL = 0               # 画素値の差がこれを超えたら「異なる画素」とみなす
+PIXEL_DIFF_RATIO = 0.001    # 異なる画素の割合の許容値
+
+# ----------------------------------------------------------------------
+# 合成コーパス生成
+# ----------------------------------------------------------------------
+# (肩の角度, 肘の角度, 股関節の角度, 膝の角度) を度数で指定した手続き的ポーズ
+SYNTHETIC_POSES = {
+    "synthetic_t_pose": (90, 0, 10, 0),
+    "synthetic_arms_down": (15, 0, 8, 0),
+    "synthetic_arms_up": (160, 10, 12, 0),
+    "synthetic_bent": (60, 70, 25, 40),
+    "synthetic_wide": (120, -30, 35, 15),
+}
+SYNTHETIC_SIZE = (512, 768)  # (幅, 高さ)
+# 重複画像スキップの確認用: 縮小・JPEG再エンコードしたコピー -> 元画像
+DEDUP_COPIES = {"synthetic_t_pose_copy": "synthetic_t_pose"}
+DEDUP_COPY_SCALE = 0.5
+
+
+def _limb(origin, length, angle_deg):
+    """origin から真下を0度として angle_deg 回転した方向に length 伸ばした点"""
+    rad = math.radians(angle_deg)
+    return (int(origin[0] + length * math.sin(rad)), int(origin[1] + length * math.cos(rad)))
+
+
+def draw_synthetic_figure(pose_params, size=SYNTHETIC_SIZE):
+    """パラメータから人型のシルエット画像（BGR）を描画"""
+    shoulder, elbow, hip, knee = pose_params
+    w, h = size
+    image = np.full((h, w, 3), (200, 210, 220), dtype=np.uint8)
+    skin = (150, 180, 225)
+    cloth = (90, 60, 40)
+
+    cx = w // 2
+    neck = (cx, int(h * 0.22))
+    pelvis = (cx, int(h * 0.52))
+    sw = int(w * 0.11)
+    hw = int(w * 0.07)
+    upper_arm, forearm = int(h * 0.14), int(h * 0.13)
+    thigh, shin = int(h * 0.2), int(h * 0.19)
+
+    # 胴体
+    cv2.rectangle(image, (cx - sw, neck[1]), (cx + sw, pelvis[1]), cloth, -1)
+
+    # 腕・脚（左右対称）
+    for side in (-1, 1):
+        s = (cx + side * sw, neck[1] + 10)
+        e = _limb(s, upper_arm, side * shoulder)
+        wr = _limb(e, forearm, side * (shoulder + elbow))
+        cv2.line(image, s, e, skin, 22)
+        cv2.line(image, e, wr, skin, 18)
+        cv2.circle(image, wr, 14, skin, -1)
+
+        p = (cx + side * hw, pelvis[1])
+        k = _limb(p, thigh, side * hip)
+        a = _limb(k, shin, side * (hip - knee))
+        cv2.line(image, p, k, cloth, 30)
+        cv2.line(image, k, a, cloth, 24)
+        cv2.ellipse(image, (a[0] + side * 12, a[1]), (22, 10), 0, 0, 360, (30, 30, 30), -1)
+
+    # 首と頭（目・鼻・口）
+    cv2.line(image, neck, (cx, neck[1] - 30), skin, 20)
+    head = (cx, neck[1] - 70)
+    cv2.circle(image, head, 48, skin, -1)
+    for side in (-1, 1):
+        cv2.circle(image, (head[0] + side * 17, head[1] - 8), 6, (40, 30, 30), -1)
+    cv2.circle(image, (head[0], head[1] + 8), 4, (110, 130, 190), -1)
+    cv2.line(image, (head[0] - 14, head[1] + 25), (head[0] + 14, head[1] + 25), (60, 60, 150), 3)
+    return image
+
+
+def draw_noise_image(seed, size=SYNTHETIC_SIZE):
+    """人物を含まない決定的なノイズ画像（未検出パスの確認用）"""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 256, size=(h // 8, w // 8, 3), dtype=np.uint8)
+    return cv2.resize(image, (w, h), interpolation=cv2.INTER_NEAREST)
+
+
+def generate_synthetic_corpus(corpus_dir):
+    """合成画像のうちコーパスフォルダに無いものを書き出す（既存ファイルはそのまま使う）"""
+    corpus_dir = Path(corpus_dir)
+    for name, params in SYNTHETIC_POSES.items():
+        if not (corpus_dir / f"{name}.png").exists():
+            write_bytes(str(corpus_dir / f"{name}.png"), encode_png(draw_synthetic_figure(params)))
+    if not (corpus_dir / "synthetic_noise.png").exists():
+        write_bytes(str(corpus_dir / "synthetic_noise.png"), encode_png(draw_noise_image(seed=0)))
+    for copy_name, source_name in DEDUP_COPIES.items():
+        if (corpus_dir / f"{copy_name}.jpg").exists():
+            continue
+        image = draw_synthetic_figure(SYNTHETIC_POSES[source_name])
+        image = cv2.resize(image, None, fx=DEDUP_COPY_SCALE, fy=DEDUP_COPY_SCALE, interpolation=cv2.INTER_AREA)
+        success, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        if not success:
+            raise ValueError(f"JPEGのエンコードに失敗: {copy_name}.jpg")
+        write_bytes(str(corpus_dir / f"{copy_name}.jpg"), encoded.tobytes())
+
+
+def list_corpus(corpus_dir):
+    """コーパス内の画像ファイルを名前順で返す"""
+    return sorted(p for p in Path(corpus_dir).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+# ----------------------------------------------------------------------
+# 比較
+# ----------------------------------------------------------------------
+def landmark_arrays(json_data):
+    """出力JSONを {キー: ndarray or None} に変換"""
+    arrays = {}
+    pose = json_data.get("pose")
+    arrays["pose"] = None if pose is None else np.array(
+        [[lm["x"], lm["y"], lm["z"], lm["visibility"]] for lm in pose], dtype=np.float64)
+    if "hands" in json_data:
+        for i, hand in enumerate(json_data["hands"]):
+            arrays[f"hand{i}"] = np.array([[lm["x"], lm["y"], lm["z"]] for lm in hand], dtype=np.float64)
+    if "face" in json_data:
+        face = json_data["face"]
+        arrays["face"] = None if face is None else np.array(
+            [[lm["x"], lm["y"], lm["z"]] for lm in face], dtype=np.float64)
+    return arrays
+
+
+def compare_landmarks(golden_json, actual_json, atol=LANDMARK_ATOL):
+    """ランドマークを比較し、問題点のリストを返す（空なら一致）"""
+    problems = []
+    golden = landmark_arrays(golden_json)
+    actual = landmark_arrays(actual_json)
+    for key in sorted(set(golden) | set(actual)):
+        g = golden.get(key)
+        a = actual.get(key)
+        if g is None and a is None:
+            continue
+        if g is None or a is None:
+            problems.append(f"{key}: 検出有無が異なる (golden={'なし' if g is None else 'あり'}, "
+                            f"actual={'なし' if a is None else 'あり'})")
+        elif g.shape != a.shape:
+            problems.append(f"{key}: 形状が異なる {g.shape} != {a.shape}")
+        else:
+            max_diff = float(np.max(np.abs(g - a))) if g.size else 0.0
+            if max_diff > atol:
+                problems.append(f"{key}: 最大誤差 {max_diff:.6f} > {atol}")
+    return problems
+
+
+def compare_images(golden_path, actual_path, pixel_tol=PIXEL_TOL, max_ratio=PIXEL_DIFF_RATIO):
+    """骨格画像を画素単位で比較し、(問題点リスト, 異なる画素の割合) を返す"""
+    golden = cv2.imdecode(np.fromfile(str(golden_path), dtype=np.uint8), cv2.IMREAD_COLOR)
+    actual = cv2.imdecode(np.fromfile(str(actual_path), dtype=np.uint8), cv2.IMREAD_COLOR)
+    if golden is None or actual is None:
+        return ["画像を読み込めません"], 1.0
+    if golden.shape != actual.shape:
+        return [f"画像サイズが異なる {golden.shape} != {actual.shape}"], 1.0
+    diff = np.abs(golden.astype(np.int16) - actual.astype(np.int16)).max(axis=2)
+    ratio = float(np.count_nonzero(diff > pixel_tol)) / diff.size
+    if ratio > max_ratio:
+        return [f"異なる画素の割合 {ratio:.4%} > {max_ratio:.4%}"], ratio
+    return [], ratio
+
+# ----------------------------------------------------------------------
+# ゴールデンの設定
+# ----------------------------------------------------------------------
+def library_versions():
+    """ゴールデンの出力に影響するライブラリのバージョン"""
+    import mediapipe
+    return {"mediapipe": mediapipe.__version__, "opencv": cv2.__version__, "numpy": np.__version__}
+
+
+def load_golden_settings(golden_dir):
+    """ゴールデン作成時の設定を読み込む（無ければ None）"""
+    path = Path(golden_dir) / GOLDEN_SETTINGS_FILENAME
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_golden_settings(golden_dir, settings):
+    """ゴールデン作成時の設定とライブラリのバージョンを保存"""
+    data = {"settings": {key: settings[key] for key in GOLDEN_SETTING_KEYS},
+            "versions": library_versions()}
+    with open(Path(golden_dir) / GOLDEN_SETTINGS_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+# ----------------------------------------------------------------------
+# 実行
+# ----------------------------------------------------------------------
+def process_image(image_path, output_dir, mode, settings=RENDER_SETTINGS, log_func=None, **kwargs):
+    """設定辞書で process_single_image を呼ぶ"""
+    return process_single_image(
+        str(image_path), str(output_dir), mode,
+        settings["complexity"], settings["visibility"],
+        settings["line_thickness"], settings["point_radius"],
+        settings["background_color"], settings["use_custom_color"],
+        settings["custom_color"], settings["single_color_mode"], log_func,
+        adaptive_complexity=settings["adaptive_complexity"],
+        **kwargs,
+    )
+
+
+def run_mode(mode, images, output_dir, settings=RENDER_SETTINGS, log_func=None):
+    """1モード分のコーパスを処理し、({ファイル名: 処理結果レコード}, 経過秒) を返す"""
+    records = {}
+    dedup_index = PoseHashIndex(str(Path(output_dir) / INDEX_FILENAME)) if settings["dedup"] else None
+    start_time = time.perf_counter()
+    for image_path in images:
+        records[image_path.name] = process_image(image_path, output_dir, mode, settings, log_func,
+                                                 dedup_index=dedup_index)
+    return records, time.perf_counter() - start_time
+
+
+def check_dedup_copy(image_path, record, golden_mode_dir, out_dir):
+    """重複コピーが元画像の結果を再利用し、コピーのサイズで描画されたかを確認する"""
+    problems = []
+    if not record.get("reused"):
+        return ["重複画像として再利用されませんでした"]
+    source_json = golden_mode_dir / f"{DEDUP_COPIES[image_path.stem]}_pose.json"
+    actual_json = out_dir / f"{image_path.stem}_pose.json"
+    actual_png = out_dir / f"{image_path.stem}_pose.png"
+    if not source_json.exists():
+        return [f"ゴールデンがありません: {source_json.name}"]
+    if not actual_json.exists() or not actual_png.exists():
+        return ["出力がありません"]
+    with open(source_json) as f:
+        golden = json.load(f)
+    with open(actual_json) as f:
+        actual = json.load(f)
+    problems.extend(compare_landmarks(golden, actual))
+    rendered = cv2.imdecode(np.fromfile(str(actual_png), dtype=np.uint8), cv2.IMREAD_COLOR)
+    source = cv2.imdecode(np.fromfile(str(image_path), dtype=np.uint8), cv2.IMREAD_COLOR)
+    if rendered is None or rendered.shape != source.shape:
+        problems.append("骨格画像がコピー画像のサイズで描画されていません")
+    elif golden.get("pose") and not rendered.any():
+        problems.append("骨格画像が描画されていません")
+    return problems
+
+
+def run_regression(corpus_dir, golden_dir, update=False, modes=None, settings=RENDER_SETTINGS, log_func=print):
+    """コーパスを全モードで処理し、ゴールデンと比較したレポートを返す"""
+    images = list_corpus(corpus_dir)
+    if not images:
+        raise FileNotFoundError(f"コーパスに画像がありません: {corpus_dir}")
+    modes = modes or list(MODES)
+
+    report = {"images": len(images), "settings": dict(settings), "modes": {}, "failures": []}
+
+    def log_errors(message):
+        # 処理ログのうちエラーのみ表示する
+        if message.startswith("❌"):
+            log_func(f"  {message}")
+
+    work_dir = Path(tempfile.mkdtemp(prefix="pose_regression_"))
+    try:
+        for mode in modes:
+            slug = MODES[mode]
+            out_dir = work_dir / slug
+            records, elapsed = run_mode(mode, images, out_dir, settings, log_func=log_errors)
+            success_count = sum(1 for record in records.values() if record["status"] in PROCESSED_STATUSES)
+            throughput = len(images) / elapsed if elapsed > 0 else 0.0
+            mode_report = {"success": success_count, "elapsed_sec": round(elapsed, 3),
+                           "images_per_sec": round(throughput, 3), "max_pixel_diff_ratio": 0.0}
+            report["modes"][mode] = mode_report
+            log_func(f"[{slug}] {success_count}/{len(images)} 成功, {elapsed:.2f}秒 ({throughput:.2f} 枚/秒)")
+
+            golden_mode_dir = Path(golden_dir) / slug
+            for image_path in images:
+                base_name = image_path.stem
+                problems = []
+                if update:
+                    # 処理に失敗した出力をゴールデンにしない
+                    record = records[image_path.name]
+                    if record["status"] not in PROCESSED_STATUSES:
+                        problems.append(f"処理に失敗しました: {record['status']} "
+                                        f"({record['stage']}/{record['error']}: {record['message']})")
+                    for suffix in GOLDEN_SUFFIXES:
+                        if not (out_dir / f"{base_name}{suffix}").exists():
+                            problems.append(f"出力がありません: {base_name}{suffix}")
+                    for problem in problems:
+                        report["failures"].append({"mode": mode, "image": image_path.name, "problem": problem})
+                        log_func(f"  ❌ {image_path.name}: {problem}")
+                    continue
+                if settings["dedup"] and base_name in DEDUP_COPIES:
+                    problems.extend(check_dedup_copy(image_path, records[image_path.name],
+                                                     golden_mode_dir, out_dir))
+                    for problem in problems:
+                        report["failures"].append({"mode": mode, "image": image_path.name, "problem": problem})
+                        log_func(f"  ❌ {image_path.name}: {problem}")
+                    continue
+                for suffix in GOLDEN_SUFFIXES:
+                    if not (golden_mode_dir / f"{base_name}{suffix}").exists():
+                        problems.append(f"ゴールデンがありません: {base_name}{suffix}")
+                    elif not (out_dir / f"{base_name}{suffix}").exists():
+                        problems.append(f"出力がありません: {base_name}{suffix}")
+                if not problems:
+                    with open(golden_mode_dir / f"{base_name}_pose.json") as f:
+                        golden_json = json.load(f)
+                    with open(out_dir / f"{base_name}_pose.json") as f:
+                        actual_json = json.load(f)
+                    problems.extend(compare_landmarks(golden_json, actual_json))
+                    image_problems, ratio = compare_images(golden_mode_dir / f"{base_name}_pose.png",
+                                                           out_dir / f"{base_name}_pose.png")
+                    problems.extend(image_problems)
+                    mode_report["max_pixel_diff_ratio"] = max(mode_report["max_pixel_diff_ratio"], ratio)
+                for problem in problems:
+                    report["failures"].append({"mode": mode, "image": image_path.name, "problem": problem})
+                    log_func(f"  ❌ {image_path.name}: {problem}")
+
+        # 全モードが問題なく処理できたときだけゴールデンを置き換える
+        if update and not report["failures"]:
+            for mode in modes:
+                golden_mode_dir = Path(golden_dir) / MODES[mode]
+                if golden_mode_dir.exists():
+                    shutil.rmtree(golden_mode_dir)
+                golden_mode_dir.mkdir(parents=True)
+                for image_path in images:
+                    for suffix in GOLDEN_SUFFIXES:
+                        name = f"{image_path.stem}{suffix}"
+                        shutil.copy2(work_dir / MODES[mode] / name, golden_mode_dir / name)
+            save_golden_settings(golden_dir, settings)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+
+# ----------------------------------------------------------------------
+# 再試行・隔離・スケジューラの確認
+# ----------------------------------------------------------------------
+ADMISSION_JOB_SEC = 0.05    # スケジューラ確認用の疑似ジョブの処理時間
+ADMISSION_WORKERS = 4
+
+def check_quarantine(image_path, work_dir, settings=RENDER_SETTINGS):
+    """壊れたファイルは隔離されて次回スキップされ、メモリ不足では隔離されないことを確認"""
+    problems = []
+    quarantine_path = work_dir / QUARANTINE_FILENAME
+    corrupt_path = work_dir / "corrupt.png"
+    write_bytes(str(corrupt_path), b"\x89PNG\r\n\x1a\n" + b"\0" * 64)
+
+    quarantine = QuarantineList(str(quarantine_path))
+    record = process_image(corrupt_path, work_dir, MODE_SIMPLE, settings, quarantine=quarantine)
+    if record["status"] != STATUS_FAILED or record["stage"] != STAGE_LOAD:
+        problems.append(f"壊れたファイル: load段階の失敗になりません ({record['status']}/{record['stage']})")
+    quarantine.save()
+    # 保存した隔離リストを読み直して次回の処理を再現する
+    quarantine = QuarantineList(str(quarantine_path))
+    record = process_image(corrupt_path, work_dir, MODE_SIMPLE, settings, quarantine=quarantine)
+    if record["status"] != STATUS_QUARANTINED:
+        problems.append(f"壊れたファイル: 2回目が隔離スキップになりません ({record['status']})")
+
+    with mock.patch.object(core, "decode_image", side_effect=MemoryError):
+        record = process_image(image_path, work_dir, MODE_SIMPLE, settings, quarantine=quarantine)
+    if record["status"] != STATUS_FAILED:
+        problems.append(f"メモリ不足: 失敗として記録されません ({record['status']})")
+    if quarantine.get(str(image_path)) is not None:
+        problems.append("メモリ不足: 隔離されました")
+    record = process_image(image_path, work_dir, MODE_SIMPLE, settings, quarantine=quarantine)
+    if record["status"] not in PROCESSED_STATUSES:
+        problems.append(f"メモリ不足の後: 再処理できません ({record['status']})")
+    return problems
+
+
+def check_io_retry(image_path, work_dir, settings=RENDER_SETTINGS):
+    """書き込み時の一時的なI/Oエラー（EIO）が再試行で回復することを確認"""
+    failures = {"left": 1}
+
+    def flaky_write_bytes(filename, data):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise OSError(errno.EIO, "模擬I/Oエラー", filename)
+        write_bytes(filename, data)
+
+    with mock.patch.object(core, "write_bytes", flaky_write_bytes), \
+            mock.patch.object(records_module, "RETRY_DELAY_SEC", 0):
+        record = process_image(image_path, work_dir, MODE_SIMPLE, settings)
+    if record["status"] != STATUS_OK or record["retries"] < 1:
+        return [f"EIO: 再試行で回復しません ({record['status']}, retries={record['retries']})"]
+    return []
+
+
+def check_scheduler_admission(image_path, work_dir, settings=RENDER_SETTINGS):
+    """並列実行中の見積もり合計が上限を超えず、サイズ不明の画像は単独で処理されることを確認"""
+    problems = []
+    unknown_path = work_dir / "unknown_size.png"
+    write_bytes(str(unknown_path), b"not an image")
+    paths = [str(path) for path in list_corpus(image_path.parent)]
+    paths.insert(len(paths) // 2, str(unknown_path))
+
+    # コーパス画像が2枚ずつ並列に入る上限
+    image_estimate = max(estimate_image_memory(read_image_size(path)) for path in paths if path != str(unknown_path))
+    scheduler = MemoryBudgetScheduler(image_estimate * 2.5 / 1024 / 1024, ADMISSION_WORKERS)
+    estimates = {path: estimate_image_memory(read_image_size(path)) if path != str(unknown_path)
+                 else scheduler.budget for path in paths}
+
+    lock = threading.Lock()
+    running = {}
+    observed = {"max_total": 0, "max_running": 0, "unknown_shared": False}
+
+    def job(path):
+        with lock:
+            running[path] = estimates[path]
+            observed["max_total"] = max(observed["max_total"], sum(running.values()))
+            observed["max_running"] = max(observed["max_running"], len(running))
+            if str(unknown_path) in running and len(running) > 1:
+                observed["unknown_shared"] = True
+        time.sleep(ADMISSION_JOB_SEC)
+        with lock:
+            del running[path]
+        return path
+
+    results, report = scheduler.run(paths, job)
+    if results != paths:
+        problems.append("結果が入力順になっていません")
+    if observed["max_total"] > scheduler.budget:
+        problems.append(f"見積もり合計 {observed['max_total']} が上限 {scheduler.budget} を超えました")
+    if observed["max_running"] < 2:
+        problems.append("並列実行されませんでした")
+    if observed["unknown_shared"]:
+        problems.append("サイズ不明の画像が他のジョブと同時に実行されました")
+    if report["estimated_peak_bytes"] > scheduler.budget:
+        problems.append(f"見積もりピーク {report['estimated_peak_bytes']} が上限を超えました")
+    return problems
+
+
+def run_robustness_checks(corpus_dir, settings=RENDER_SETTINGS, log_func=print):
+    """再試行・隔離・スケジューラの確認を実行し、問題点のリストを返す"""
+    image_path = Path(corpus_dir) / f"{next(iter(SYNTHETIC_POSES))}.png"
+    checks = [("隔離", check_quarantine), ("I/O再試行", check_io_retry),
+              ("メモリ上限", check_scheduler_admission)]
+    failures = []
+    work_dir = Path(tempfile.mkdtemp(prefix="pose_robustness_"))
+    try:
+        for name, check in checks:
+            problems = check(image_path, work_dir, settings)
+            log_func(f"[{name}] {'OK' if not problems else 'NG'}")
+            for problem in problems:
+                failures.append({"check": name, "problem": problem})
+                log_func(f"  ❌ {problem}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MediaPipe Pose Extractor 回帰テスト")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR), help="入力画像フォルダ")
+    parser.add_argument("--golden", default=str(DEFAULT_GOLDEN_DIR), help="ゴールデン出力フォルダ")
+    parser.add_argument("--update", action="store_true", help="現在の出力をゴールデンとして保存")
+    parser.add_argument("--mode", choices=list(MODES.values()), action="append",
+                        help="対象モード（複数指定可、省略時は全モード）")
+    parser.add_argument("--complexity", type=int, choices=[0, 1, 2],
+                        help=f"モデル精度（更新時の既定値は {RENDER_SETTINGS['complexity']}、"
+                             "比較時はゴールデンの設定を使う）")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="自動精度で処理（通常モードとは別のゴールデンフォルダを指定すること）")
+    parser.add_argument("--dedup", action="store_true",
+                        help="重複画像スキップを有効にし、コピー画像が元画像の結果を再利用するか確認")
+    parser.add_argument("--robustness", action="store_true",
+                        help="ゴールデン比較の代わりに再試行・隔離・メモリ上限の動作を確認")
+    parser.add_argument("--report", help="レポートJSONの保存先")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.corpus, exist_ok=True)
+    generate_synthetic_corpus(args.corpus)
+
+    if args.robustness:
+        settings = dict(RENDER_SETTINGS)
+        if args.complexity is not None:
+            settings["complexity"] = args.complexity
+        failures = run_robustness_checks(args.corpus, settings)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump({"settings": settings, "failures": failures}, f, indent=2, ensure_ascii=False)
+        if failures:
+            print(f"❌ 問題あり: {len(failures)}件")
+            return 1
+        print("✅ 再試行・隔離・メモリ上限は想定どおりに動作しました")
+        return 0
+
+    modes = [m for m, slug in MODES.items() if slug in args.mode] if args.mode else None
+    if args.update and args.dedup:
+        parser.error("--dedup ではゴールデンを更新できません（ゴールデンは通常の推論結果から作成する）")
+
+    requested = {"complexity": args.complexity if args.complexity is not None else RENDER_SETTINGS["complexity"],
+                 "adaptive_complexity": args.adaptive}
+    golden_settings = load_golden_settings(args.golden)
+    if golden_settings is not None and (not args.update or modes):
+        # 比較時・一部モードの更新時はゴールデン作成時の設定に揃える
+        for key in GOLDEN_SETTING_KEYS:
+            explicit = args.complexity is not None if key == "complexity" else args.adaptive
+            if explicit and requested[key] != golden_settings["settings"][key]:
+                parser.error(f"{key}={requested[key]} はゴールデンの設定 "
+                             f"({key}={golden_settings['settings'][key]}) と異なります")
+        requested = dict(golden_settings["settings"])
+        versions = library_versions()
+        for name, version in golden_settings.get("versions", {}).items():
+            if versions.get(name) != version:
+                print(f"⚠️ {name} のバージョンがゴールデン作成時と異なります: {version} -> {versions.get(name)}")
+    elif not args.update:
+        print(f"⚠️ {GOLDEN_SETTINGS_FILENAME} が無いため、指定した設定で比較します")
+    settings = dict(RENDER_SETTINGS, dedup=args.dedup, **requested)
+    report = run_regression(args.corpus, args.golden, update=args.update, modes=modes, settings=settings)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.update:
+        if report["failures"]:
+            print(f"❌ 処理に失敗したためゴールデンを更新しませんでした: {len(report['failures'])}件")
+            return 1
+        print(f"✅ ゴールデンを更新しました: {args.golden}")
+        return 0
+    if report["failures"]:
+        print(f"❌ 差分あり: {len(report['failures'])}件")
+        return 1
+    print("✅ ゴールデンと一致しました")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())